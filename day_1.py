@@ -1,4 +1,15 @@
 import re
+from typing import Tuple, Dict, List, Optional, Iterable
+from collections import deque
+import numpy as np
+
+from engines import register_engine
+
+
+SUBSTITUTIONS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9
+}
 
 
 def extract_calibration(line: str) -> int:
@@ -7,15 +18,11 @@ def extract_calibration(line: str) -> int:
 
 
 def enumerate_calibration_digits(line: str) -> int:
-    substitutions = {
-        'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
-        'seven': 7, 'eight': 8, 'nine': 9
-    }
-    regex = re.compile('|'.join(substitutions.keys()) + '|\d')
+    regex = re.compile('|'.join(SUBSTITUTIONS.keys()) + '|\d')
     start_idx = 0
     while (match := regex.search(line, start_idx)) is not None:
-        if match.group(0) in substitutions.keys():
-            yield str(substitutions[match.group(0)])
+        if match.group(0) in SUBSTITUTIONS.keys():
+            yield str(SUBSTITUTIONS[match.group(0)])
         else:
             yield match.group(0)
         start_idx = match.start() + 1
@@ -26,9 +33,114 @@ def extract_calibration_aligned(line: str) -> int:
     return int(f'{digits[0]}{digits[-1]}')
 
 
+def extract_both_calibrations(line: str) -> Tuple[int, int]:
+    digits, aligned_digits = [], []
+    for idx, char in enumerate(line):
+        if char.isdigit():
+            digits.append(char)
+            aligned_digits.append(char)
+            continue
+        word = next((w for w in SUBSTITUTIONS.keys() if line.startswith(w, idx)), None)
+        if word is not None:
+            aligned_digits.append(str(SUBSTITUTIONS[word]))
+    return (int(f'{digits[0]}{digits[-1]}'),
+            int(f'{aligned_digits[0]}{aligned_digits[-1]}'))
+
+
+# none of the digit words contains another one, so the first match found
+# while scanning is also the one that starts first
+class DigitAutomaton:
+    def __init__(self, words: Dict[str, int]):
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.outputs: List[Optional[int]] = [None]
+        for word, value in words.items():
+            state = 0
+            for char in word:
+                if char not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.outputs.append(None)
+                    self.transitions[state][char] = len(self.transitions) - 1
+                state = self.transitions[state][char]
+            self.outputs[state] = value
+        self.__link_failures(set(''.join(words.keys())))
+
+    def __link_failures(self, alphabet: Iterable[str]):
+        failures = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            if self.outputs[state] is None:
+                self.outputs[state] = self.outputs[failures[state]]
+            for char in alphabet:
+                fallback = self.transitions[failures[state]].get(char, 0)
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    if fallback != 0:
+                        self.transitions[state][char] = fallback
+                else:
+                    failures[next_state] = fallback
+                    queue.append(next_state)
+
+    def find_first(self, text: Iterable[str]) -> Optional[int]:
+        state = 0
+        for char in text:
+            state = self.transitions[state].get(char, 0)
+            if (value := self.outputs[state]) is not None:
+                return value
+        return None
+
+
+DIGIT_WORDS = {**SUBSTITUTIONS, **{str(d): d for d in range(10)}}
+DIGITS_AUTOMATON = DigitAutomaton(DIGIT_WORDS)
+REVERSED_DIGITS_AUTOMATON = DigitAutomaton({w[::-1]: d for w, d in DIGIT_WORDS.items()})
+
+
+def extract_calibration_automaton(line: str) -> int:
+    first = DIGITS_AUTOMATON.find_first(line)
+    if first is None:
+        raise ValueError(f'No digits in line: {line}')
+    return 10 * first + REVERSED_DIGITS_AUTOMATON.find_first(reversed(line))
+
+
+def sum_calibrations_vectorized(buffer: bytes, lines_count: int) -> int:
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    line_ids = np.cumsum(data == ord('\n'))
+    digit_positions = np.flatnonzero((data >= ord('0')) & (data <= ord('9')))
+    if len(digit_positions) == 0:
+        if lines_count > 0:
+            raise ValueError('Found line without digits')
+        return 0
+    digit_lines = line_ids[digit_positions]
+    digits = data[digit_positions].astype(np.int64) - ord('0')
+    line_changes = digit_lines[1:] != digit_lines[:-1]
+    firsts = np.concatenate(([True], line_changes))
+    lasts = np.concatenate((line_changes, [True]))
+    if np.count_nonzero(firsts) != lines_count:
+        raise ValueError('Found line without digits')
+    return int(10 * digits[firsts].sum() + digits[lasts].sum())
+
+
 def resolve_part1(input):
     return sum(extract_calibration(l) for l in input)
 
 
 def resolve_part2(input):
-    return sum(extract_calibration_aligned(l) for l in input)
\ No newline at end of file
+    return sum(extract_calibration_aligned(l) for l in input)
+
+
+def resolve_both(input):
+    part1, part2 = 0, 0
+    for calibration, aligned_calibration in map(extract_both_calibrations, input):
+        part1 += calibration
+        part2 += aligned_calibration
+    return part1, part2
+
+
+@register_engine('numpy', part='1', min_input_size=500)
+def resolve_part1_numpy(input):
+    return sum_calibrations_vectorized('\n'.join(input).encode('ascii'), len(input))
+
+
+@register_engine('automaton', part='2')
+def resolve_part2_automaton(input):
+    return sum(extract_calibration_automaton(l) for l in input)
@@ -1,11 +1,15 @@
 from typing import List, Iterator, Tuple, Set
 import itertools
 
+from tracing import traced
+from gc_stats import freeze_parsed_model
+
 
 Grid = List[str]
 Position = Tuple[int, int]
 
 
+@traced('parse')
 def parse_padded_grid(lines: List[str]) -> Grid:
     width = len(lines[0])
     horizontal_padding = ''.join(itertools.repeat('.', width + 2))
@@ -132,8 +136,12 @@ def count_tiles_in_loop(grid: Grid) -> int:
 
 
 def resolve_part1(input):
-    return len(traverse_loop(parse_padded_grid(input))) // 2
+    grid = parse_padded_grid(input)
+    freeze_parsed_model()
+    return len(traverse_loop(grid)) // 2
 
 
 def resolve_part2(input):
-    return count_tiles_in_loop(parse_padded_grid(input))
\ No newline at end of file
+    grid = parse_padded_grid(input)
+    freeze_parsed_model()
+    return count_tiles_in_loop(grid)
\ No newline at end of file
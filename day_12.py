@@ -2,6 +2,8 @@ from typing import NamedTuple, List, Tuple, Dict, Iterable
 import itertools
 import re
 
+from tracing import traced
+
 
 CacheKey = Tuple[str, str]
 
@@ -11,6 +13,7 @@ class SpringsRecord(NamedTuple):
     summary: List[int]
 
 
+@traced('parse')
 def parse_records(lines: List[str]) -> List[SpringsRecord]:
     def parse_one(line: str) -> SpringsRecord:
         lhs, rhs = line.split()
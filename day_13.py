@@ -1,6 +1,8 @@
-from typing import List, NamedTuple, Optional
+from typing import List, NamedTuple, Optional, Tuple
 import itertools
 
+from tracing import traced
+
 
 class Pattern(NamedTuple):
     grid: List[str]
@@ -8,6 +10,7 @@ class Pattern(NamedTuple):
     height: int
 
 
+@traced('parse')
 def parse_patterns(lines: List[str]) -> List[Pattern]:
     def parse_one(pattern_str: List[str]) -> Pattern:
         return Pattern(grid=pattern_str, width=len(pattern_str[0]), height=len(pattern_str))
@@ -91,9 +94,51 @@ def score_smudged_pattern(pattern: Pattern) -> Optional[int]:
     raise RuntimeError('No smudge found')
 
 
+def count_reflection_differences(pattern: Pattern, pos: int, limit: int = 2) -> int:
+    diffs = 0
+    for i, j in zip(range(pos, -1, -1), range(pos + 1, pattern.height)):
+        diffs += sum(1 for a, b in zip(pattern.grid[i], pattern.grid[j]) if a != b)
+        if diffs >= limit:
+            return limit
+    return diffs
+
+
+def find_reflections_horizontally(pattern: Pattern) -> Tuple[Optional[int], Optional[int]]:
+    exact, smudged = None, None
+    for y in range(pattern.height - 1):
+        diffs = count_reflection_differences(pattern, y)
+        if diffs == 0 and exact is None:
+            exact = y
+        elif diffs == 1 and smudged is None:
+            smudged = y
+    return exact, smudged
+
+
+def score_pattern_both_ways(pattern: Pattern) -> Tuple[int, int]:
+    horizontal = find_reflections_horizontally(pattern)
+    vertical = (find_reflections_horizontally(transpose(pattern))
+                if None in horizontal else (None, None))
+    def score(h: Optional[int], v: Optional[int], error: str) -> int:
+        if h is not None:
+            return 100 * (h + 1)
+        if v is not None:
+            return v + 1
+        raise RuntimeError(error)
+    return (score(horizontal[0], vertical[0], 'No mirror'),
+            score(horizontal[1], vertical[1], 'No smudge found'))
+
+
 def resolve_part1(input):
     return sum(score_pattern(p) for p in parse_patterns(input))
 
 
 def resolve_part2(input):
-    return sum(score_smudged_pattern(p) for p in parse_patterns(input))
\ No newline at end of file
+    return sum(score_smudged_pattern(p) for p in parse_patterns(input))
+
+
+def resolve_both(input):
+    part1, part2 = 0, 0
+    for exact, smudged in map(score_pattern_both_ways, parse_patterns(input)):
+        part1 += exact
+        part2 += smudged
+    return part1, part2
\ No newline at end of file
@@ -3,6 +3,9 @@ import itertools
 from enum import Enum
 from copy import deepcopy
 
+from tracing import traced
+from gc_stats import freeze_parsed_model
+
 
 Position = Tuple[int, int]
 
@@ -14,6 +17,7 @@ class TiltDirection(Enum):
     EAST = 3
 
 
+@traced('parse')
 def parse_rocks_positions(lines: List[str]) -> Tuple[Set[Position], Set[Position]]:
     cubes, rounded = set(), set()
     rev = list(reversed(lines))
@@ -146,7 +150,9 @@ def calc_rock_load(pos: Position) -> int:
 
 
 def resolve_part1(input):
-    return sum(calc_rock_load(r) for r in TiltPlatform(input).tilt(TiltDirection.NORTH))
+    platform = TiltPlatform(input)
+    freeze_parsed_model()
+    return sum(calc_rock_load(r) for r in platform.tilt(TiltDirection.NORTH))
 
 
 def resolve_part2(input):
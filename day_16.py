@@ -1,13 +1,29 @@
-from typing import List, NamedTuple, Tuple, Optional, Set
+from typing import List, NamedTuple, Tuple, Optional, Set, Iterator, Callable, Sequence
 from enum import Enum
 from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import os
 import sys
 
+from shared_grid import SharedGrid, AttachedGrid, share_grid, attach_grid
+from engines import register_engine
+from tracing import traced, span, TraceConfig, worker_config, init_worker
+import progress
+
 
 Position = Tuple[int, int]
 
+# tiles are compared as byte values, so that worker processes can read
+# the layout directly from a shared memory block
+EMPTY = ord('.')
+MIRROR = ord('/')
+BACK_MIRROR = ord('\\')
+VERTICAL_SPLITTER = ord('|')
+HORIZONTAL_SPLITTER = ord('-')
+
 class Layout(NamedTuple):
-    values: List[str]
+    # bytes rows, or memoryview rows of a shared grid in worker processes
+    values: Sequence[bytes]
     width: int
     height: int
 
@@ -21,8 +37,9 @@ class Direction(Enum):
 Beam = Tuple[Position, Direction]
 
 
+@traced('parse')
 def parse_layout(lines: List[str]):
-    return Layout(lines, width=len(lines[0]), height=len(lines))
+    return Layout([line.encode('ascii') for line in lines], width=len(lines[0]), height=len(lines))
 
 
 def is_in_bounds(layout: Layout, position: Position) -> bool:
@@ -44,22 +61,22 @@ def advance_beam(layout: Layout, beam: Beam) -> Optional[Position]:
     return new_pos if is_in_bounds(layout, new_pos) else None
 
 
-def reflect_beam(beam_direction: Beam, mirror: str) -> Direction:
+def reflect_beam(beam_direction: Beam, mirror: int) -> Direction:
     if beam_direction == Direction.RIGHT:
-        return Direction.DOWN if mirror == '\\' else Direction.UP
+        return Direction.DOWN if mirror == BACK_MIRROR else Direction.UP
     elif beam_direction == Direction.LEFT:
-        return Direction.UP if mirror == '\\' else Direction.DOWN
+        return Direction.UP if mirror == BACK_MIRROR else Direction.DOWN
     elif beam_direction == Direction.DOWN:
-        return Direction.RIGHT if mirror == '\\' else Direction.LEFT
+        return Direction.RIGHT if mirror == BACK_MIRROR else Direction.LEFT
     elif beam_direction == Direction.UP:
-        return Direction.LEFT if mirror == '\\' else Direction.RIGHT
+        return Direction.LEFT if mirror == BACK_MIRROR else Direction.RIGHT
 
 
-def split_beam(beam_direction: Direction, splitter: str) -> Optional[Tuple[Direction, Direction]]:
+def split_beam(beam_direction: Direction, splitter: int) -> Optional[Tuple[Direction, Direction]]:
     if beam_direction == Direction.RIGHT or beam_direction == Direction.LEFT:
-        return (Direction.UP, Direction.DOWN) if splitter == '|' else None
+        return (Direction.UP, Direction.DOWN) if splitter == VERTICAL_SPLITTER else None
     else:
-        return (Direction.LEFT, Direction.RIGHT) if splitter == '-' else None
+        return (Direction.LEFT, Direction.RIGHT) if splitter == HORIZONTAL_SPLITTER else None
 
 
 def follow_beam(layout: Layout, beam: Beam, cache: Set[Beam]):
@@ -71,16 +88,16 @@ def follow_beam(layout: Layout, beam: Beam, cache: Set[Beam]):
     cache.add(beam)
 
     current = layout.values[y][x]
-    if current == '.':
+    if current == EMPTY:
         next_pos = advance_beam(layout, beam)
         if next_pos is not None:
             follow_beam(layout, (next_pos, direction), cache)
-    elif current == '\\' or current == '/':
+    elif current == BACK_MIRROR or current == MIRROR:
         reflected = (pos, reflect_beam(direction, current))
         next_pos = advance_beam(layout, reflected)
         if next_pos is not None:
             follow_beam(layout, (next_pos, reflected[1]), cache)
-    elif current == '-' or current == '|':
+    elif current == HORIZONTAL_SPLITTER or current == VERTICAL_SPLITTER:
         splitted = split_beam(direction, current)
         if splitted:
             follow_beam(layout, (pos, splitted[0]), cache)
@@ -90,21 +107,90 @@ def follow_beam(layout: Layout, beam: Beam, cache: Set[Beam]):
             follow_beam(layout, (next_pos, direction), cache)
 
 
+def follow_beam_iterative(layout: Layout, starting_beam: Beam) -> Set[Beam]:
+    visited = set()
+    beams = [starting_beam]
+    while beams:
+        beam = beams.pop()
+        if beam in visited:
+            continue
+        visited.add(beam)
+
+        pos, direction = beam
+        x, y = pos
+        current = layout.values[y][x]
+        if current == BACK_MIRROR or current == MIRROR:
+            direction = reflect_beam(direction, current)
+        elif current == HORIZONTAL_SPLITTER or current == VERTICAL_SPLITTER:
+            splitted = split_beam(direction, current)
+            if splitted:
+                beams.extend((pos, d) for d in splitted)
+                continue
+        next_pos = advance_beam(layout, (pos, direction))
+        if next_pos is not None:
+            beams.append((next_pos, direction))
+    return visited
+
+
 def count_energised_tiles(layout: Layout, starting_beam: Beam) -> int:
     cache = set()
     follow_beam(layout, starting_beam, cache)
     return len({beam[0] for beam in cache})
 
 
-def find_best_outcome(layout: Layout):
-    def enumerate_starting_beams():
-        for i in range(layout.width):
-            yield ((i, 0), Direction.DOWN)
-            yield ((i, layout.height - 1), Direction.UP)
-        for i in range(layout.height):
-            yield ((0, i), Direction.RIGHT)
-            yield ((layout.width - 1, i), Direction.LEFT)
-    return max(*map(partial(count_energised_tiles, layout), enumerate_starting_beams()))
+def count_energised_tiles_iterative(layout: Layout, starting_beam: Beam) -> int:
+    return len({beam[0] for beam in follow_beam_iterative(layout, starting_beam)})
+
+
+def enumerate_starting_beams(layout: Layout) -> Iterator[Beam]:
+    for i in range(layout.width):
+        yield ((i, 0), Direction.DOWN)
+        yield ((i, layout.height - 1), Direction.UP)
+    for i in range(layout.height):
+        yield ((0, i), Direction.RIGHT)
+        yield ((layout.width - 1, i), Direction.LEFT)
+
+
+def find_best_outcome(layout: Layout,
+                      counter: Callable[[Layout, Beam], int] = count_energised_tiles) -> int:
+    return max(*map(partial(counter, layout), enumerate_starting_beams(layout)))
+
+
+worker_grid: Optional[AttachedGrid] = None
+worker_layout: Optional[Layout] = None
+
+
+def attach_worker_layout(grid: SharedGrid, trace_config: Optional[TraceConfig]):
+    global worker_grid, worker_layout
+    init_worker(trace_config)
+    progress.restore_default_termination()
+    sys.setrecursionlimit(10000)
+    # the attachment is kept alive for the worker's lifetime, its rows are
+    # read in place and released by its finalizer when the worker exits
+    worker_grid = attach_grid(grid)
+    worker_layout = Layout(worker_grid.rows, grid.width, grid.height)
+
+
+def count_energised_tiles_in_worker(counter: Callable[[Layout, Beam], int],
+                                    starting_beam: Beam) -> int:
+    with span('count energised tiles'):
+        return counter(worker_layout, starting_beam)
+
+
+def find_best_outcome_parallel(layout: Layout,
+                               workers: Optional[int] = None,
+                               counter: Callable[[Layout, Beam], int] = count_energised_tiles) -> int:
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers == 1:
+        return find_best_outcome(layout, counter)
+    beams = list(enumerate_starting_beams(layout))
+    with share_grid(layout.values) as grid:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=attach_worker_layout,
+                                 initargs=(grid, worker_config())) as executor:
+            chunksize = max(1, len(beams) // (4 * workers))
+            return max(executor.map(partial(count_energised_tiles_in_worker, counter),
+                                    beams, chunksize=chunksize))
 
 
 def resolve_part1(input):
@@ -114,4 +200,20 @@ def resolve_part1(input):
 
 def resolve_part2(input):
     sys.setrecursionlimit(10000)
-    return find_best_outcome(parse_layout(input))
\ No newline at end of file
+    return find_best_outcome(parse_layout(input))
+
+
+@register_engine('iterative', part='1')
+def resolve_part1_iterative(input):
+    return count_energised_tiles_iterative(parse_layout(input), starting_beam=((0, 0), Direction.RIGHT))
+
+
+@register_engine('iterative', part='2')
+def resolve_part2_iterative(input):
+    return find_best_outcome(parse_layout(input), counter=count_energised_tiles_iterative)
+
+
+# worth its pool start-up only for grids of real puzzle size
+@register_engine('parallel', part='2', min_input_size=10000)
+def resolve_part2_parallel(input):
+    return find_best_outcome_parallel(parse_layout(input), counter=count_energised_tiles_iterative)
@@ -3,6 +3,10 @@ from heapq import heappush, heappop
 from enum import Enum
 from functools import partial
 
+from engines import register_engine
+from gc_stats import freeze_parsed_model
+from tracing import traced
+
 
 class Direction(Enum):
     RIGHT = 0
@@ -16,6 +20,7 @@ Position = Tuple[int, int]
 Node = Tuple[Position, Direction, int]
 
 
+@traced('parse')
 def parse_heatloss_map(lines: List[str]) -> HeatlossMap:
     return [[int(num) for num in row] for row in lines]
 
@@ -137,8 +142,43 @@ class DijkstraAlgorithm:
         raise RuntimeError('Failed to find path')
     
 
+# heat losses are single digits, so distances can be bucketed directly
+# instead of being ordered by a heap
+class BucketQueueAlgorithm:
+    def __init__(self,
+                 heatloss_map: HeatlossMap,
+                 continuations_callback: Callable[[Node], Iterator[Node]],
+                 target_node_predicate: Callable[[Node], bool]):
+        self.heatloss_map = heatloss_map
+        self.__visited: Set[Node] = set()
+        self.__continue = continuations_callback
+        self.__target_check = target_node_predicate
+
+    def run_algorithm(self) -> int:
+        starting_pos = (0, 0)
+        buckets: List[List[Node]] = [[(starting_pos, Direction.RIGHT, 0),
+                                      (starting_pos, Direction.DOWN, 0)]]
+        distance = 0
+        while distance < len(buckets):
+            for node in buckets[distance]:
+                if self.__target_check(node):
+                    return distance
+                if node in self.__visited:
+                    continue
+                self.__visited.add(node)
+                for neigh in self.__continue(self.heatloss_map, node):
+                    x, y = neigh[0]
+                    neigh_distance = distance + self.heatloss_map[y][x]
+                    while len(buckets) <= neigh_distance:
+                        buckets.append([])
+                    buckets[neigh_distance].append(neigh)
+            distance += 1
+        raise RuntimeError('Failed to find path')
+
+
 def resolve_part1(input):
     heatloss = parse_heatloss_map(input)
+    freeze_parsed_model()
     target = get_target(heatloss)
     algo = DijkstraAlgorithm(heatloss, continue_path_part1, partial(check_target_part1, target))
     return algo.run_algorithm()
@@ -146,6 +186,25 @@ def resolve_part1(input):
 
 def resolve_part2(input):
     heatloss = parse_heatloss_map(input)
+    freeze_parsed_model()
     target = get_target(heatloss)
     algo = DijkstraAlgorithm(heatloss, continue_path_part2, partial(check_target_part2, target))
-    return algo.run_algorithm()
\ No newline at end of file
+    return algo.run_algorithm()
+
+
+@register_engine('bucket-queue', part='1')
+def resolve_part1_bucket_queue(input):
+    heatloss = parse_heatloss_map(input)
+    freeze_parsed_model()
+    target = get_target(heatloss)
+    algo = BucketQueueAlgorithm(heatloss, continue_path_part1, partial(check_target_part1, target))
+    return algo.run_algorithm()
+
+
+@register_engine('bucket-queue', part='2')
+def resolve_part2_bucket_queue(input):
+    heatloss = parse_heatloss_map(input)
+    freeze_parsed_model()
+    target = get_target(heatloss)
+    algo = BucketQueueAlgorithm(heatloss, continue_path_part2, partial(check_target_part2, target))
+    return algo.run_algorithm()
@@ -2,6 +2,8 @@ from typing import NamedTuple, List, Iterable, Tuple
 import re
 import itertools
 
+from tracing import traced
+
 
 class DigStep(NamedTuple):
     direction: str
@@ -9,6 +11,7 @@ class DigStep(NamedTuple):
     color: str
 
 
+@traced('parse')
 def parse_dig_plan(lines: Iterable[str]) -> List[DigStep]:
     def parse_one(line: str) -> DigStep:
         m = re.match(r'(\w) (\d+) \(#([0-9a-f]+)\)', line)
@@ -3,6 +3,8 @@ import re
 import itertools
 from functools import partial
 
+from tracing import traced
+
 
 class Part(NamedTuple):
     x: int
@@ -36,6 +38,7 @@ def parse_instruction(ins_str: str) -> Instruction:
     return ins_str
 
 
+@traced('parse')
 def parse_input(lines: List[str]) -> Tuple[Dict[str, List[Instruction]], List[Part]]:
     workflow_regex = re.compile(r'(\w+)\{(.+)\}')
     part_regex = re.compile(r'\{x=(\d+),m=(\d+),a=(\d+),s=(\d+)\}')
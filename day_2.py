@@ -1,9 +1,13 @@
 import re
-from typing import NamedTuple, List
+from typing import NamedTuple, List, Iterable, Sequence
 import itertools
+import numpy as np
+
+from engines import register_engine
 
 
 GAME_REGEX = re.compile(r'Game (\d+): (.*)')
+CUBES_REGEX = re.compile(r'(\d+) (blue|green|red)')
 
 
 class Reveal(NamedTuple):
@@ -17,30 +21,68 @@ class Game(NamedTuple):
     reveals: List[Reveal]
 
 
+BAG = Reveal(blue=14, green=13, red=12)
+
+
+class GameStore(NamedTuple):
+    ids: np.ndarray
+    max_blue: np.ndarray
+    max_green: np.ndarray
+    max_red: np.ndarray
+
+
 def parse_game(line: str) -> Game:
     game_match = GAME_REGEX.fullmatch(line)
     result = Game(int(game_match.group(1)), [])
     reveals_str = game_match.group(2).split(';')
     for reveal in reveals_str:
-        blue_match = re.search(r'(\d+) blue', reveal)
-        blues = int(blue_match.group(1)) if blue_match is not None else 0
-        green_match = re.search(r'(\d+) green', reveal)
-        greens = int(green_match.group(1)) if green_match is not None else 0
-        red_match = re.search(r'(\d+) red', reveal)
-        reds = int(red_match.group(1)) if red_match is not None else 0
-        result.reveals.append(Reveal(blues, greens, reds))
+        cubes = {color: int(count) for count, color in CUBES_REGEX.findall(reveal)}
+        result.reveals.append(Reveal(**{color: cubes.get(color, 0) for color in Reveal._fields}))
     return result
 
 
-def is_game_impossible(game: Game) -> bool:
-    return any(r.red > 12 or r.green > 13 or r.blue > 14 for r in game.reveals)
+def parse_game_store(lines: Iterable[str]) -> GameStore:
+    ids, maxima = [], []
+    for line in lines:
+        colon_idx = line.index(':')
+        game_maxima = dict.fromkeys(Reveal._fields, 0)
+        for count, color in CUBES_REGEX.findall(line, colon_idx):
+            game_maxima[color] = max(game_maxima[color], int(count))
+        ids.append(int(line[5:colon_idx]))
+        maxima.append([game_maxima[color] for color in Reveal._fields])
+    columns = np.array(maxima, dtype=np.int64).reshape(-1, len(Reveal._fields)).T
+    return GameStore(np.array(ids, dtype=np.int64), *columns)
+
+
+def is_reveal_impossible(reveal: Reveal, bag: Reveal = BAG) -> bool:
+    return reveal.red > bag.red or reveal.green > bag.green or reveal.blue > bag.blue
+
+
+def is_game_impossible(game: Game, bag: Reveal = BAG) -> bool:
+    return any(is_reveal_impossible(r, bag) for r in game.reveals)
+
+
+def find_max_reveal(game: Game) -> Reveal:
+    return Reveal(blue=max(r.blue for r in game.reveals),
+                  green=max(r.green for r in game.reveals),
+                  red=max(r.red for r in game.reveals))
 
 
 def calculate_power_set(game: Game) -> int:
-    blues = max(r.blue for r in game.reveals)
-    greens = max(r.green for r in game.reveals)
-    reds = max(r.red for r in game.reveals)
-    return blues * greens * reds
+    maxima = find_max_reveal(game)
+    return maxima.blue * maxima.green * maxima.red
+
+
+def sum_possible_game_ids(store: GameStore, bags: Sequence[Reveal]) -> np.ndarray:
+    limits = np.array(bags, dtype=np.int64).reshape(-1, len(Reveal._fields))
+    possible = ((store.max_blue <= limits[:, 0:1]) &
+                (store.max_green <= limits[:, 1:2]) &
+                (store.max_red <= limits[:, 2:3]))
+    return possible.astype(np.int64) @ store.ids
+
+
+def sum_power_sets(store: GameStore) -> int:
+    return int(np.sum(store.max_blue * store.max_green * store.max_red))
 
 
 def resolve_part1(input):
@@ -49,4 +91,24 @@ def resolve_part1(input):
 
 
 def resolve_part2(input):
-    return sum(map(calculate_power_set, map(parse_game, input)))
\ No newline at end of file
+    return sum(map(calculate_power_set, map(parse_game, input)))
+
+
+def resolve_both(input):
+    part1, part2 = 0, 0
+    for game in map(parse_game, input):
+        maxima = find_max_reveal(game)
+        if not is_reveal_impossible(maxima):
+            part1 += game.id
+        part2 += maxima.blue * maxima.green * maxima.red
+    return part1, part2
+
+
+@register_engine('columnar', part='1', min_input_size=10000)
+def resolve_part1_columnar(input):
+    return int(sum_possible_game_ids(parse_game_store(input), [BAG])[0])
+
+
+@register_engine('columnar', part='2', min_input_size=10000)
+def resolve_part2_columnar(input):
+    return sum_power_sets(parse_game_store(input))
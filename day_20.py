@@ -2,6 +2,8 @@ from typing import NamedTuple, Dict, Tuple, Union, List, Optional
 from queue import Queue
 from dataclasses import dataclass
 
+from tracing import traced
+
 
 @dataclass
 class FlipFlop:
@@ -22,6 +24,7 @@ ConfigItem = Tuple[Optional[Union[FlipFlop, Conjunction]], List[str]]
 Configuration = Dict[str, ConfigItem]
 
 
+@traced('parse')
 def parse_config(lines: List[str]) -> Dict[str, ConfigItem]:
     def parse_one(line: str) -> Tuple[str, ConfigItem]:
         name, rest = line.split(' -> ')
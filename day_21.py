@@ -2,6 +2,9 @@ from typing import NamedTuple, List, Tuple, Iterator, Callable
 import itertools
 from heapq import heappop, heappush
 
+from gc_stats import freeze_parsed_model
+from tracing import traced
+
 
 class Grid(NamedTuple):
     content: List[str]
@@ -13,6 +16,7 @@ Position = Tuple[int, int]
 Point = Tuple[int, int]
 
 
+@traced('parse')
 def parse_grid(lines: List[str]) -> Grid:
     return Grid(lines, len(lines[0]), len(lines))
 
@@ -116,6 +120,7 @@ def calculate_quadratic_coeffs(grid: Grid) -> Tuple[int, int, int]:
 
 def resolve_part1(input):
     grid = parse_grid(input)
+    freeze_parsed_model()
     start_pos = find_starting_position(grid)
     algo = DijkstraAlgorithm(grid, continue_for_finite_grid)
     return algo.run_algorithm(start_pos, step_limit=64)
@@ -123,6 +128,7 @@ def resolve_part1(input):
 
 def resolve_part2(input):
     grid = parse_grid(input)
-    a, b, c = calculate_quadratic_coeffs(parse_grid(input))
+    freeze_parsed_model()
+    a, b, c = calculate_quadratic_coeffs(grid)
     size = 26501365 // grid.width
     return a * size ** 2 + b * size + c
\ No newline at end of file
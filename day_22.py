@@ -4,6 +4,8 @@ import itertools
 from queue import PriorityQueue
 from functools import partial
 
+from tracing import traced
+
 
 Point = Tuple[int, int, int]
 Range = Tuple[int, int]
@@ -24,6 +26,7 @@ def top(brick: Brick) -> int:
     return max(brick.begin[2], brick.end[2])
 
 
+@traced('parse')
 def parse_bricks(lines: List[str]) -> List[Brick]:
     def parse_one(line: str) -> Brick:
         beg, end = line.split('~')
@@ -2,6 +2,10 @@ from typing import NamedTuple, Dict, Tuple, Set, List, Iterator
 from collections import defaultdict
 from queue import Queue
 
+from progress import Progress, track
+from gc_stats import freeze_parsed_model
+from tracing import traced
+
 
 Point = Tuple[int, int]
 Path = Tuple[Tuple[Point, Point], int]
@@ -13,6 +17,7 @@ class HikingTrail(NamedTuple):
     target: Point
 
 
+@traced('parse')
 def parse_trail(lines: List[str]) -> HikingTrail:
     terrain = {}
     for y, row in enumerate(lines):
@@ -138,7 +143,9 @@ def find_longest_path_ignore_slopes_impl(graph: Dict[Point, Edge],
                                          start_node: Point,
                                          cur_level: int,
                                          target_node: Point,
-                                         visited: Set[Point]) -> int:
+                                         visited: Set[Point],
+                                         progress: Progress) -> int:
+    progress.advance()
     if start_node == target_node:
         return 0
 
@@ -157,7 +164,7 @@ def find_longest_path_ignore_slopes_impl(graph: Dict[Point, Edge],
         else:
             lvl = cur_level + 1
         length = find_longest_path_ignore_slopes_impl(
-            graph, levels, node, lvl, target_node, visited.copy()
+            graph, levels, node, lvl, target_node, visited.copy(), progress
         )
         if length is not None:
             longest = max(longest, length + weight)
@@ -168,12 +175,15 @@ def find_longest_path_ignore_slopes(trail: HikingTrail) -> int:
     paths = collect_paths(trail)
     graph = build_graph(paths)
     levels = bfs(graph, trail.source)
+    freeze_parsed_model()
     return find_longest_path_ignore_slopes_impl(
-        graph, levels, trail.source, 0, trail.target, visited=set())
+        graph, levels, trail.source, 0, trail.target, visited=set(),
+        progress=track('day 23 paths'))
 
 
 def resolve_part1(input):
     trail = parse_trail(input)
+    freeze_parsed_model()
     return find_longest_path(trail, trail.source, set())
 
 
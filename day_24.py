@@ -1,8 +1,12 @@
 from typing import NamedTuple, List, Tuple, Optional
 import re
 import itertools
+import math
 import numpy as np
 
+from progress import track
+from tracing import traced
+
 
 class Vector(NamedTuple):
     x: int
@@ -16,6 +20,7 @@ class Hailstone(NamedTuple):
 Point6D = Tuple[float, float, float, float, float, float]
 
 
+@traced('parse')
 def parse_hailstones(lines: List[str]) -> List[Hailstone]:
     def parse_one(line: str) -> Hailstone:
         m = re.fullmatch(r'(\d+), (\d+), (\d+) @\s*(-?\d+),\s*(-?\d+),\s*(-?\d+)', line)
@@ -149,7 +154,9 @@ def check_solution_on_all_hailstones(hailstones: List[Hailstone], arg: Point6D)
 
 
 def find_rock_throw_position(hailstones: List[Hailstone]) -> Tuple[int, int, int]:
+    progress = track('day 24 hailstone triples', total=math.comb(len(hailstones), 3))
     for h1, h2, h3 in itertools.combinations(hailstones, 3):
+        progress.advance()
         pos = try_hailstones(h1, h2, h3)
         if pos is not None and check_solution_on_all_hailstones(hailstones, pos):
             return pos[0], pos[1], pos[2]
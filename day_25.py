@@ -4,12 +4,17 @@ from collections import defaultdict, Counter
 import re
 import sys
 from queue import Queue
+import math
+
+from progress import track
+from tracing import traced
 
 
 Graph = Dict[str, List[str]]
 Wire = Tuple[str, str]
 
 
+@traced('parse')
 def parse_connections(lines: List[str]) -> Graph:
     graph = defaultdict(list)
     for line in lines:
@@ -79,7 +84,9 @@ def map_connections_usage(graph: Graph) -> Dict[str, int]:
 def find_separation(graph: Graph,
                     wires_connectivity: Dict[str, int]) -> Tuple[Set[str], Set[str]]:
     wires = sorted(wires_connectivity.items(), key=lambda w: w[1], reverse=True)
+    progress = track('day 25 wire triples', total=math.comb(len(wires), 3))
     for unplugged in itertools.combinations((wire for wire, _ in wires), 3):
+        progress.advance()
         groups = get_separated_pair(graph, unplugged)
         if groups is not None:
             return groups[0], groups[1]
@@ -1,5 +1,10 @@
-from typing import NamedTuple, List, Iterator, Tuple, Set, Optional
+from typing import NamedTuple, List, Iterator, Tuple, Set, Optional, Iterable
 import itertools
+import re
+import numpy as np
+
+from tracing import traced
+from engines import register_engine
 
 
 class EngineSchematic(NamedTuple):
@@ -12,6 +17,7 @@ def get_char_from_schematics(schematics: EngineSchematic, x: int, y: int) -> str
     return schematics.schema[y][x]
 
 
+@traced('parse')
 def parse_engine_schematics(input: List[str]) -> EngineSchematic:
     return EngineSchematic(schema=input, width=len(input[0]), height=len(input))
 
@@ -41,6 +47,170 @@ def get_positions_around_point(schematics: EngineSchematic,
     return list(filter(is_in_bounds, neighbours))
 
 
+class NumberIndex(NamedTuple):
+    # number id for every cell of the schema, -1 where there is no digit
+    cells: List[List[int]]
+    values: List[int]
+
+
+def build_number_index(schematics: EngineSchematic) -> NumberIndex:
+    cells, values = [], []
+    for row in schematics.schema:
+        row_cells = [-1] * schematics.width
+        for m in re.finditer(r'\d+', row):
+            row_cells[m.start():m.end()] = itertools.repeat(len(values), m.end() - m.start())
+            values.append(int(m.group(0)))
+        cells.append(row_cells)
+    return NumberIndex(cells, values)
+
+
+def get_symbol_positions_row_major(schematics: EngineSchematic) -> Iterator[Tuple[int, int]]:
+    for y, row in enumerate(schematics.schema):
+        for x, char in enumerate(row):
+            if char != '.' and not char.isdigit():
+                yield (x, y)
+
+
+def find_adjacent_numbers(schematics: EngineSchematic,
+                          index: NumberIndex,
+                          position: Tuple[int, int]) -> Set[int]:
+    ids = {index.cells[y][x] for x, y in get_positions_around_point(schematics, position)}
+    ids.discard(-1)
+    return ids
+
+
+def sum_part_numbers_indexed(schematics: EngineSchematic) -> int:
+    index = build_number_index(schematics)
+    part_ids = set()
+    for pos in get_symbol_positions_row_major(schematics):
+        part_ids.update(find_adjacent_numbers(schematics, index, pos))
+    return sum(index.values[i] for i in part_ids)
+
+
+def sum_gear_ratios_indexed(schematics: EngineSchematic) -> int:
+    index = build_number_index(schematics)
+    result = 0
+    for x, y in get_symbol_positions_row_major(schematics):
+        if schematics.schema[y][x] != '*':
+            continue
+        ids = find_adjacent_numbers(schematics, index, (x, y))
+        if len(ids) == 2:
+            first, second = ids
+            result += index.values[first] * index.values[second]
+    return result
+
+
+class SchematicRow(NamedTuple):
+    text: str
+    # (begin, end, value) with end exclusive
+    numbers: List[Tuple[int, int, int]]
+
+
+RowWindow = Tuple[Optional[SchematicRow], SchematicRow, Optional[SchematicRow]]
+
+
+def is_symbol(char: str) -> bool:
+    return char != '.' and not char.isdigit()
+
+
+def scan_row(text: str) -> SchematicRow:
+    text = text.rstrip('\n')
+    return SchematicRow(text, [(m.start(), m.end(), int(m.group(0)))
+                               for m in re.finditer(r'\d+', text)])
+
+
+def sliding_rows(rows: Iterable[str]) -> Iterator[RowWindow]:
+    previous, current = None, None
+    for text in rows:
+        row = scan_row(text)
+        if current is not None:
+            yield previous, current, row
+        previous, current = current, row
+    if current is not None:
+        yield previous, current, None
+
+
+def stream_part_numbers(rows: Iterable[str]) -> int:
+    result = 0
+    for window in sliding_rows(rows):
+        texts = [row.text for row in window if row is not None]
+        for begin, end, value in window[1].numbers:
+            if any(is_symbol(c) for text in texts for c in text[max(begin - 1, 0):end + 1]):
+                result += value
+    return result
+
+
+def stream_gear_ratios(rows: Iterable[str]) -> int:
+    result = 0
+    for window in sliding_rows(rows):
+        text = window[1].text
+        x = text.find('*')
+        while x != -1:
+            adjacent = [value for row in window if row is not None
+                        for begin, end, value in row.numbers if begin <= x + 1 and end >= x]
+            if len(adjacent) == 2:
+                result += adjacent[0] * adjacent[1]
+            x = text.find('*', x + 1)
+    return result
+
+
+NEIGHBOURHOOD = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
+
+def to_grid_array(schematics: EngineSchematic) -> np.ndarray:
+    data = np.frombuffer(''.join(schematics.schema).encode('ascii'), dtype=np.uint8)
+    return data.reshape(schematics.height, schematics.width)
+
+
+def gather_neighbourhood(values: np.ndarray, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+    padded = np.pad(values, 1)
+    return np.stack([padded[ys + dy + 1, xs + dx + 1] for dx, dy in NEIGHBOURHOOD], axis=-1)
+
+
+def label_number_runs(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    digits = (grid >= ord('0')) & (grid <= ord('9'))
+    begins = digits.copy()
+    begins[:, 1:] &= ~digits[:, :-1]
+    ends = digits.copy()
+    ends[:, :-1] &= ~digits[:, 1:]
+    # labels start at 1 so that 0 marks cells without a digit
+    labels = np.cumsum(begins.ravel()).reshape(grid.shape) * digits
+    digit_idx = np.flatnonzero(digits)
+    digit_labels = labels.ravel()[digit_idx]
+    powers = np.flatnonzero(ends)[digit_labels - 1] - digit_idx
+    values = np.zeros(np.count_nonzero(begins) + 1, dtype=np.int64)
+    np.add.at(values, digit_labels,
+              (grid.ravel()[digit_idx].astype(np.int64) - ord('0')) * 10 ** powers)
+    return labels, values
+
+
+def sum_part_numbers_vectorized(schematics: EngineSchematic) -> int:
+    grid = to_grid_array(schematics)
+    labels, values = label_number_runs(grid)
+    symbols = (labels == 0) & (grid != ord('.'))
+    padded = np.pad(symbols, 1)
+    adjacent = np.zeros_like(symbols)
+    for dx, dy in NEIGHBOURHOOD:
+        adjacent |= padded[1 + dy:1 + dy + grid.shape[0], 1 + dx:1 + dx + grid.shape[1]]
+    parts = np.zeros(len(values), dtype=bool)
+    parts[labels[adjacent]] = True
+    parts[0] = False
+    return int(values[parts].sum())
+
+
+def sum_gear_ratios_vectorized(schematics: EngineSchematic) -> int:
+    grid = to_grid_array(schematics)
+    labels, values = label_number_runs(grid)
+    ys, xs = np.nonzero(grid == ord('*'))
+    around = np.sort(gather_neighbourhood(labels, ys, xs), axis=1)
+    distinct = (around != 0) & np.concatenate(
+        (np.ones((len(ys), 1), dtype=bool), around[:, 1:] != around[:, :-1]), axis=1)
+    gears = np.count_nonzero(distinct, axis=1) == 2
+    around = around[gears]
+    smallest = np.where(around == 0, around.max(axis=1, keepdims=True), around).min(axis=1)
+    return int(np.sum(values[smallest] * values[around.max(axis=1)]))
+
+
 class PartNumbersParser:
     def __init__(self, schematics: EngineSchematic):
         self.__schema = schematics
@@ -104,4 +274,34 @@ def resolve_part1(input):
 
 def resolve_part2(input):
     parser = PartNumbersParser(parse_engine_schematics(input))
-    return parser.sum_gear_ratios()
\ No newline at end of file
+    return parser.sum_gear_ratios()
+
+
+@register_engine('indexed', part='1')
+def resolve_part1_indexed(input):
+    return sum_part_numbers_indexed(parse_engine_schematics(input))
+
+
+@register_engine('indexed', part='2')
+def resolve_part2_indexed(input):
+    return sum_gear_ratios_indexed(parse_engine_schematics(input))
+
+
+@register_engine('streaming', part='1')
+def resolve_part1_streaming(input):
+    return stream_part_numbers(input)
+
+
+@register_engine('streaming', part='2')
+def resolve_part2_streaming(input):
+    return stream_gear_ratios(input)
+
+
+@register_engine('numpy', part='1', min_input_size=10000)
+def resolve_part1_numpy(input):
+    return sum_part_numbers_vectorized(parse_engine_schematics(input))
+
+
+@register_engine('numpy', part='2', min_input_size=10000)
+def resolve_part2_numpy(input):
+    return sum_gear_ratios_vectorized(parse_engine_schematics(input))
@@ -1,5 +1,10 @@
-from typing import NamedTuple, Iterable, Set, Dict, Tuple
+from typing import NamedTuple, Iterable, Set, Dict, Tuple, List, Sequence
+from collections import deque
 import re
+import numpy as np
+
+from tracing import traced
+from engines import register_engine
 
 
 class Card(NamedTuple):
@@ -7,6 +12,7 @@ class Card(NamedTuple):
     numbers: Set[int]
 
 
+@traced('parse')
 def parse_cards(lines: Iterable[str]) -> Dict[int, Card]:
     def parse_one(line: str) -> Tuple[int, Card]:
         colon_idx = line.find(':')
@@ -38,9 +44,92 @@ def count_scratchcards(cards: Dict[int, Card]) -> int:
     return sum(copies.values())
 
 
+def numbers_to_mask(numbers_str: str) -> int:
+    mask = 0
+    for n in numbers_str.split():
+        mask |= 1 << int(n)
+    return mask
+
+
+def count_card_matches(line: str) -> int:
+    winning_str, numbers_str = line[line.find(':') + 1:].split('|')
+    return (numbers_to_mask(winning_str) & numbers_to_mask(numbers_str)).bit_count()
+
+
+def stream_card_scores(lines: Iterable[str]) -> int:
+    matches = map(count_card_matches, lines)
+    return sum(1 << (m - 1) for m in matches if m > 0)
+
+
+def stream_scratchcards(lines: Iterable[str]) -> int:
+    # pending[i] holds copies won so far for the card i + 1 positions ahead,
+    # so it never grows past the largest match count
+    pending = deque()
+    total = 0
+    for line in lines:
+        copies = 1 + (pending.popleft() if pending else 0)
+        total += copies
+        for i in range(count_card_matches(line)):
+            if i < len(pending):
+                pending[i] += copies
+            else:
+                pending.append(copies)
+    return total
+
+
+def parse_card_arrays(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    splitted = [line[line.find(':') + 1:].split('|') for line in lines]
+    def to_array(columns: Iterable[str]) -> np.ndarray:
+        return np.fromstring(' '.join(columns), dtype=np.int64, sep=' ').reshape(len(lines), -1)
+    return to_array(w for w, _ in splitted), to_array(n for _, n in splitted)
+
+
+def count_matches_batch(winning: np.ndarray, numbers: np.ndarray) -> np.ndarray:
+    size = int(max(winning.max(initial=0), numbers.max(initial=0))) + 1
+    rows = np.arange(len(winning))[:, np.newaxis]
+    winning_table = np.zeros((len(winning), size), dtype=bool)
+    winning_table[rows, winning] = True
+    numbers_table = np.zeros((len(numbers), size), dtype=bool)
+    numbers_table[rows, numbers] = True
+    return np.count_nonzero(winning_table & numbers_table, axis=1)
+
+
+def score_match_counts(matches: np.ndarray) -> int:
+    won = matches[matches > 0]
+    return int(np.sum(np.left_shift(1, won - 1, dtype=np.int64)))
+
+
+def cascade_copies(matches: Sequence[int]) -> int:
+    copies = [1] * len(matches)
+    for card_idx, count in enumerate(matches):
+        for i in range(card_idx + 1, min(card_idx + 1 + count, len(copies))):
+            copies[i] += copies[card_idx]
+    return sum(copies)
+
+
 def resolve_part1(input):
     return score_cards(parse_cards(input).values())
 
 
 def resolve_part2(input):
-    return count_scratchcards(parse_cards(input))
\ No newline at end of file
+    return count_scratchcards(parse_cards(input))
+
+
+@register_engine('streaming', part='1')
+def resolve_part1_streaming(input):
+    return stream_card_scores(input)
+
+
+@register_engine('streaming', part='2')
+def resolve_part2_streaming(input):
+    return stream_scratchcards(input)
+
+
+@register_engine('numpy', part='1', min_input_size=10000)
+def resolve_part1_numpy(input):
+    return score_match_counts(count_matches_batch(*parse_card_arrays(input)))
+
+
+@register_engine('numpy', part='2', min_input_size=10000)
+def resolve_part2_numpy(input):
+    return cascade_copies(count_matches_batch(*parse_card_arrays(input)).tolist())
@@ -2,6 +2,12 @@ import re
 from typing import NamedTuple, List, Iterable, Iterator, Tuple, Optional
 import math
 import itertools
+import functools
+from bisect import bisect_right
+import numpy as np
+
+from tracing import traced
+from engines import register_engine
 
 
 class MappingRange(NamedTuple):
@@ -15,6 +21,18 @@ class Interval(NamedTuple):
     end: int
 
 
+# value + offsets[i] for values in [starts[i], starts[i + 1]), starts[0] is -inf
+class PiecewiseLinear(NamedTuple):
+    starts: List[int]
+    offsets: List[int]
+
+
+class StageArrays(NamedTuple):
+    source_begins: np.ndarray
+    dest_begins: np.ndarray
+    counts: np.ndarray
+
+
 class Almanac(NamedTuple):
     soil_map: List[MappingRange]
     fertilizer_map: List[MappingRange]
@@ -25,6 +43,7 @@ class Almanac(NamedTuple):
     location_map: List[MappingRange]
 
 
+@traced('parse')
 def parse_almanac(lines: List[str]) -> Tuple[Almanac, List[int]]:
     def parse_range(line: str) -> MappingRange:
         m = re.match(r'(\d+) (\d+) (\d+)', line)
@@ -111,33 +130,95 @@ def map_intervals(values_range: Interval,
     return result
 
 
-def map_seed_range(seed_range: Interval, almanac: Almanac) -> List[Interval]:
-    soils = map_intervals(seed_range, almanac.soil_map)
-    fertilizers = list(
-        itertools.chain.from_iterable(map_intervals(sr, almanac.fertilizer_map)
-                                      for sr in soils)
-    )
-    waters = list(
-        itertools.chain.from_iterable(map_intervals(fr, almanac.water_map)
-                                      for fr in fertilizers)
-    )
-    lights = list(
-        itertools.chain.from_iterable(map_intervals(wr, almanac.light_map)
-                                      for wr in waters)
-    )
-    temperatures = list(
-        itertools.chain.from_iterable(map_intervals(lr, almanac.temperature_map)
-                                      for lr in lights)
-    )
-    humiditys = list(
-        itertools.chain.from_iterable(map_intervals(tr, almanac.humidity_map)
-                                      for tr in temperatures)
-    )
-    locations = list(
-        itertools.chain.from_iterable(map_intervals(hr, almanac.location_map)
-                                      for hr in humiditys)
+def coalesce_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    result: List[Interval] = []
+    for interval in sorted(intervals):
+        if result and interval.begin <= result[-1].end + 1:
+            result[-1] = Interval(result[-1].begin, max(result[-1].end, interval.end))
+        else:
+            result.append(interval)
+    return result
+
+
+def map_interval_set(intervals: List[Interval], mappings: List[MappingRange]) -> List[Interval]:
+    return coalesce_intervals(
+        itertools.chain.from_iterable(map_intervals(i, mappings) for i in intervals)
     )
-    return locations
+
+
+def map_seed_ranges(seed_ranges: List[Interval], almanac: Almanac) -> List[Interval]:
+    return functools.reduce(map_interval_set, almanac, coalesce_intervals(seed_ranges))
+
+
+def map_seed_range(seed_range: Interval, almanac: Almanac) -> List[Interval]:
+    return map_seed_ranges([seed_range], almanac)
+
+
+def merge_segments(starts: List[int], offsets: List[int]) -> PiecewiseLinear:
+    merged = PiecewiseLinear([starts[0]], [offsets[0]])
+    for start, offset in zip(starts[1:], offsets[1:]):
+        if offset != merged.offsets[-1]:
+            merged.starts.append(start)
+            merged.offsets.append(offset)
+    return merged
+
+
+def to_piecewise_linear(mappings: List[MappingRange]) -> PiecewiseLinear:
+    starts, offsets = [-math.inf], [0]
+    for m in mappings:
+        if starts[-1] == m.source_begin:
+            offsets[-1] = m.dest_begin - m.source_begin
+        else:
+            starts.append(m.source_begin)
+            offsets.append(m.dest_begin - m.source_begin)
+        starts.append(m.source_begin + m.count)
+        offsets.append(0)
+    return merge_segments(starts, offsets)
+
+
+def compose(first: PiecewiseLinear, second: PiecewiseLinear) -> PiecewiseLinear:
+    starts, offsets = [], []
+    ends = itertools.chain(first.starts[1:], [math.inf])
+    for begin, end, offset in zip(first.starts, ends, first.offsets):
+        idx = bisect_right(second.starts, begin + offset) - 1
+        while idx < len(second.starts) and second.starts[idx] - offset < end:
+            starts.append(max(begin, second.starts[idx] - offset))
+            offsets.append(offset + second.offsets[idx])
+            idx += 1
+    return merge_segments(starts, offsets)
+
+
+def compose_almanac(almanac: Almanac) -> PiecewiseLinear:
+    return functools.reduce(compose, map(to_piecewise_linear, almanac))
+
+
+def evaluate(function: PiecewiseLinear, value: int) -> int:
+    return value + function.offsets[bisect_right(function.starts, value) - 1]
+
+
+def find_min_in_interval(function: PiecewiseLinear, interval: Interval) -> int:
+    first = bisect_right(function.starts, interval.begin) - 1
+    last = bisect_right(function.starts, interval.end)
+    candidates = (start + offset for start, offset
+                  in zip(function.starts[first + 1:last], function.offsets[first + 1:last]))
+    return min(itertools.chain([interval.begin + function.offsets[first]], candidates))
+
+
+def to_stage_arrays(mappings: List[MappingRange]) -> StageArrays:
+    columns = np.array(mappings, dtype=np.int64).reshape(-1, len(MappingRange._fields)).T
+    return StageArrays(*columns)
+
+
+def map_values_vectorized(values: np.ndarray, stage: StageArrays) -> np.ndarray:
+    idx = np.searchsorted(stage.source_begins, values, side='right') - 1
+    clipped = np.maximum(idx, 0)
+    offsets = values - stage.source_begins[clipped]
+    mapped = (idx >= 0) & (offsets < stage.counts[clipped])
+    return np.where(mapped, stage.dest_begins[clipped] + offsets, values)
+
+
+def map_seeds_to_locations(almanac: Almanac, seeds: np.ndarray) -> np.ndarray:
+    return functools.reduce(map_values_vectorized, map(to_stage_arrays, almanac), seeds)
 
 
 def resolve_part1(input):
@@ -147,6 +228,24 @@ def resolve_part1(input):
 
 def resolve_part2(input):
     almanac, seeds = parse_almanac(input)
-    seed_ranges = build_seed_intervals(seeds)
-    result_ranges = (map_seed_range(sr, almanac) for sr in seed_ranges)
-    return min(r.begin for r in itertools.chain.from_iterable(result_ranges))
\ No newline at end of file
+    return map_seed_ranges(build_seed_intervals(seeds), almanac)[0].begin
+
+
+@register_engine('composed', part='1')
+def resolve_part1_composed(input):
+    almanac, seeds = parse_almanac(input)
+    location = compose_almanac(almanac)
+    return min(evaluate(location, seed) for seed in seeds)
+
+
+@register_engine('numpy', part='1', min_input_size=10000)
+def resolve_part1_numpy(input):
+    almanac, seeds = parse_almanac(input)
+    return int(map_seeds_to_locations(almanac, np.array(seeds, dtype=np.int64)).min())
+
+
+@register_engine('composed', part='2')
+def resolve_part2_composed(input):
+    almanac, seeds = parse_almanac(input)
+    location = compose_almanac(almanac)
+    return min(find_min_in_interval(location, sr) for sr in build_seed_intervals(seeds))
@@ -1,20 +1,24 @@
 import re
-from typing import NamedTuple, List
+from typing import NamedTuple, List, Iterable
 import math
 import functools
 
+from tracing import traced
+
 
 class Race(NamedTuple):
     time: int
     record: int
 
 
+@traced('parse')
 def parse_races(lines: List[str]) -> List[Race]:
     times = map(int, re.findall(r'\d+', lines[0]))
     dists = map(int, re.findall(r'\d+', lines[1]))
     return [Race(t, d) for t, d in zip(times, dists)]
 
 
+@traced('parse')
 def parse_entire_race(lines: List[str]) -> Race:
     time = int(lines[0].replace('Time:', '').replace(' ', ''))
     record = int(lines[1].replace('Distance:', '').replace(' ', ''))
@@ -25,23 +29,29 @@ def calculate_distance(total_time: int, time_to_hold: int) -> int:
     return time_to_hold * (total_time - time_to_hold)
 
 
-def count_ways_to_win(race: Race):
-    return sum(1 for i in range(1, race.time) if calculate_distance(race.time, i) > race.record)
+# winning hold times lie strictly between the roots of h * (time - h) = record;
+# isqrt gives the lower root up to one step, which is then corrected exactly
+def count_ways_to_win(race: Race) -> int:
+    delta = race.time ** 2 - 4 * race.record
+    if delta < 0:
+        return 0
+    shortest = max(1, (race.time - math.isqrt(delta)) // 2)
+    while shortest > 1 and calculate_distance(race.time, shortest - 1) > race.record:
+        shortest -= 1
+    while shortest <= race.time // 2 and calculate_distance(race.time, shortest) <= race.record:
+        shortest += 1
+    longest = race.time - shortest
+    return max(0, longest - shortest + 1)
 
 
-def count_ways_to_win_part2(race: Race):
-    delta = race.time ** 2 - 4 * race.record
-    n1 = (race.time - math.sqrt(delta)) / 2
-    begin = math.ceil(n1) if math.ceil(n1) != n1 else math.ceil(n1) + 1
-    n2 = (race.time + math.sqrt(delta)) / 2
-    end = math.floor(n2) if math.floor(n2) != n2 else math.floor(n2) - 1
-    return end - begin + 1
+def count_ways_to_win_batch(races: Iterable[Race]) -> List[int]:
+    return [count_ways_to_win(race) for race in races]
 
 
 def resolve_part1(input):
     races = parse_races(input)
-    return functools.reduce(lambda x, y: x * y, map(count_ways_to_win, races), 1)
+    return functools.reduce(lambda x, y: x * y, count_ways_to_win_batch(races), 1)
 
 
 def resolve_part2(input):
-    return count_ways_to_win_part2(parse_entire_race(input))
\ No newline at end of file
+    return count_ways_to_win(parse_entire_race(input))
\ No newline at end of file
@@ -1,6 +1,12 @@
-from typing import Iterable, List, Tuple, Dict, Type
+from typing import Iterable, List, Tuple, Dict, Callable, Any, NamedTuple, Optional
 from collections import Counter
 from enum import IntEnum
+import functools
+import os
+import numpy as np
+
+from tracing import traced
+from engines import register_engine
 
 
 CARDS_MAPPING = {
@@ -24,6 +30,17 @@ class HandKind(IntEnum):
     FIVE = 6
 
 
+class KindTables(NamedTuple):
+    # HandKind values indexed by hand_index, one byte per hand
+    standard: bytes
+    joker: bytes
+
+
+HAND_SIZE = 5
+HANDS_COUNT = len(CARDS_MAPPING) ** HAND_SIZE
+
+
+@traced('parse')
 def parse_hands(lines: Iterable[str]) -> List[Tuple[str, int]]:
     def parse_one(line: str) -> Tuple[str, int]:
         card, bid = line.split()
@@ -92,8 +109,106 @@ class HandJokerComparator:
         return compare_cards(self.cards, other.cards, CARDS_MAPPING_WITH_JOKER)
 
 
-def get_total_winnings(hands: List[Tuple[str, int]], comparatorType: Type) -> int:
-    hands.sort(key=lambda x: comparatorType(x[0]))
+# kind in the top bits followed by 4 bits per card, so that comparing keys
+# compares kinds first and then cards from left to right
+def encode_hand(cards: str, kind: HandKind, mapping: Dict[str, int]) -> int:
+    key = int(kind)
+    for c in cards:
+        key = (key << 4) | mapping[c]
+    return key
+
+
+def hand_index(cards: str) -> int:
+    index = 0
+    for c in cards:
+        index = index * len(CARDS_MAPPING) + CARDS_MAPPING[c] - 1
+    return index
+
+
+def classify_card_counts(counts: np.ndarray) -> np.ndarray:
+    ordered = -np.sort(-counts, axis=1)
+    first, second = ordered[:, 0], ordered[:, 1]
+    kinds = np.full(len(counts), HandKind.HIGH_CARDS, dtype=np.uint8)
+    kinds[first == 2] = HandKind.PAIR
+    kinds[(first == 2) & (second == 2)] = HandKind.TWO_PAIR
+    kinds[first == 3] = HandKind.THREE
+    kinds[(first == 3) & (second == 2)] = HandKind.FULL
+    kinds[first == 4] = HandKind.FOUR
+    kinds[first == 5] = HandKind.FIVE
+    return kinds
+
+
+# cards given as indices into CARDS_MAPPING order, one hand per row
+def classify_card_matrix(cards: np.ndarray, with_joker: bool) -> np.ndarray:
+    rows = np.arange(len(cards))
+    counts = np.zeros((len(cards), len(CARDS_MAPPING)), dtype=np.int8)
+    for position in cards.T:
+        counts[rows, position] += 1
+    if with_joker:
+        joker = CARDS_MAPPING['J'] - 1
+        jokers = counts[:, joker].copy()
+        counts[:, joker] = 0
+        counts[rows, counts.argmax(axis=1)] += jokers
+    return classify_card_counts(counts)
+
+
+def build_kind_tables() -> KindTables:
+    cards = np.indices((len(CARDS_MAPPING),) * HAND_SIZE).reshape(HAND_SIZE, -1).T
+    return KindTables(classify_card_matrix(cards, with_joker=False).tobytes(),
+                      classify_card_matrix(cards, with_joker=True).tobytes())
+
+
+@functools.lru_cache(maxsize=None)
+def load_kind_tables(path: Optional[str] = None) -> KindTables:
+    if path is not None and os.path.exists(path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        # a file of any other size is truncated or stale and gets rebuilt below
+        if len(data) == 2 * HANDS_COUNT:
+            return KindTables(data[:HANDS_COUNT], data[HANDS_COUNT:])
+    tables = build_kind_tables()
+    if path is not None:
+        with open(path, 'wb') as file:
+            file.write(tables.standard + tables.joker)
+    return tables
+
+
+def classify_hands_batch(indices: np.ndarray, table: bytes) -> np.ndarray:
+    return np.frombuffer(table, dtype=np.uint8)[indices]
+
+
+def hand_sort_key(cards: str) -> int:
+    kind = load_kind_tables().standard[hand_index(cards)]
+    return encode_hand(cards, kind, CARDS_MAPPING)
+
+
+def hand_joker_sort_key(cards: str) -> int:
+    kind = load_kind_tables().joker[hand_index(cards)]
+    return encode_hand(cards, kind, CARDS_MAPPING_WITH_JOKER)
+
+
+def parse_hands_columnar(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    card_bytes = np.frombuffer(''.join(line[:HAND_SIZE] for line in lines).encode('ascii'),
+                               dtype=np.uint8)
+    to_index = np.zeros(256, dtype=np.uint8)
+    for c, val in CARDS_MAPPING.items():
+        to_index[ord(c)] = val - 1
+    bids = np.fromstring(' '.join(line[HAND_SIZE:] for line in lines), dtype=np.int64, sep=' ')
+    return to_index[card_bytes].reshape(-1, HAND_SIZE), bids
+
+
+def rank_hands_vectorized(cards: np.ndarray, bids: np.ndarray, with_joker: bool) -> int:
+    mapping = CARDS_MAPPING_WITH_JOKER if with_joker else CARDS_MAPPING
+    to_value = np.array([mapping[c] for c in CARDS_MAPPING.keys()], dtype=np.int64)
+    keys = classify_card_matrix(cards, with_joker).astype(np.int64)
+    for position in cards.T:
+        keys = (keys << 4) | to_value[position]
+    order = np.argsort(keys, kind='stable')
+    return int(bids[order] @ np.arange(1, len(bids) + 1, dtype=np.int64))
+
+
+def get_total_winnings(hands: List[Tuple[str, int]], sort_key: Callable[[str], Any]) -> int:
+    hands.sort(key=lambda x: sort_key(x[0]))
     return sum(rank * item[1] for rank, item in enumerate(hands, start=1))
 
 
@@ -102,4 +217,24 @@ def resolve_part1(input):
 
 
 def resolve_part2(input):
-    return get_total_winnings(parse_hands(input), HandJokerComparator)
\ No newline at end of file
+    return get_total_winnings(parse_hands(input), HandJokerComparator)
+
+
+@register_engine('packed', part='1')
+def resolve_part1_packed(input):
+    return get_total_winnings(parse_hands(input), hand_sort_key)
+
+
+@register_engine('packed', part='2')
+def resolve_part2_packed(input):
+    return get_total_winnings(parse_hands(input), hand_joker_sort_key)
+
+
+@register_engine('numpy', part='1', min_input_size=10000)
+def resolve_part1_numpy(input):
+    return rank_hands_vectorized(*parse_hands_columnar(input), with_joker=False)
+
+
+@register_engine('numpy', part='2', min_input_size=10000)
+def resolve_part2_numpy(input):
+    return rank_hands_vectorized(*parse_hands_columnar(input), with_joker=True)
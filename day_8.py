@@ -1,8 +1,12 @@
 import re
-from typing import NamedTuple, Dict, Tuple, List
+from typing import NamedTuple, Dict, Tuple, List, Optional
 import itertools
 import math
 import functools
+import numpy as np
+
+from tracing import traced
+from engines import register_engine
 
 
 class Network(NamedTuple):
@@ -10,6 +14,17 @@ class Network(NamedTuple):
     nodes: Dict[str, Tuple[str, str]]
 
 
+class CompiledNetwork(NamedTuple):
+    names: List[str]
+    # targets[0][node] is the left and targets[1][node] the right connection
+    targets: Tuple[List[int], List[int]]
+    instructions: List[int]
+    # node reached after one full pass of the instructions
+    period_jump: List[int]
+    # (step, node) for every ??Z node visited during one pass, steps in 1..period
+    period_hits: List[List[Tuple[int, int]]]
+
+
 class PathCycle(NamedTuple):
     start: int
     length: int
@@ -17,6 +32,7 @@ class PathCycle(NamedTuple):
     zs_in_cycle: List[int]
 
 
+@traced('parse')
 def parse_network(lines: List[str]) -> Network:
     def parse_connection(line: str) -> Tuple[str, str, str]:
         m = re.match(r'(\w+) = \((\w+), (\w+)\)', line)
@@ -121,17 +137,185 @@ def lcm(*nums) -> int:
     return functools.reduce(lcm_impl, nums)
 
 
-def solve_with_lcm(network: Network) -> int:
-    starting_nodes = list(filter(lambda n: n[-1] == 'A', network.nodes.keys()))
-    paths = [find_cycle_in_path(network, node) for node in starting_nodes]
+def solve_cycles_with_lcm(paths: List[PathCycle]) -> int:
     if not is_lcm_viable_solution(paths):
         raise Exception("Does not work for the general problem")
     return lcm(*(path.length for path in paths))
 
 
+def is_z_at_step(cycle: PathCycle, step: int) -> bool:
+    if step < cycle.start:
+        return step in cycle.zs_before_cycle
+    return (step - cycle.start) % cycle.length + cycle.start in cycle.zs_in_cycle
+
+
+def combine_congruences(a1: int, m1: int, a2: int, m2: int) -> Optional[Tuple[int, int]]:
+    g = math.gcd(m1, m2)
+    if (a2 - a1) % g != 0:
+        return None
+    k = (a2 - a1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+    modulus = m1 // g * m2
+    return (a1 + m1 * k) % modulus, modulus
+
+
+# every path hits ??Z at step t >= start iff t = z (mod length) for some z in its
+# cycle, so common steps past all cycle starts are solutions of combined congruences;
+# earlier steps can only be pre-cycle hits of the path entering its cycle last
+def solve_cycles_with_crt(paths: List[PathCycle]) -> int:
+    latest_start = max(paths, key=lambda p: p.start)
+    for step in sorted(latest_start.zs_before_cycle):
+        if all(is_z_at_step(p, step) for p in paths):
+            return step
+
+    congruences = {(0, 1)}
+    for path in paths:
+        residues = {z % path.length for z in path.zs_in_cycle}
+        combined = (combine_congruences(a, m, r, path.length) for a, m in congruences for r in residues)
+        congruences = {c for c in combined if c is not None}
+    if not congruences:
+        raise RuntimeError('Paths never reach ??Z nodes at the same time')
+    begin = latest_start.start
+    return min(begin + (a - begin) % m for a, m in congruences)
+
+
+def solve_cycles(paths: List[PathCycle]) -> int:
+    if is_lcm_viable_solution(paths):
+        return solve_cycles_with_lcm(paths)
+    return solve_cycles_with_crt(paths)
+
+
+def solve_with_cycles(network: Network) -> int:
+    starting_nodes = list(filter(lambda n: n[-1] == 'A', network.nodes.keys()))
+    return solve_cycles([find_cycle_in_path(network, node) for node in starting_nodes])
+
+
+def compile_network(network: Network) -> CompiledNetwork:
+    names = list(network.nodes.keys())
+    ids = {name: idx for idx, name in enumerate(names)}
+    targets = ([ids[network.nodes[n][0]] for n in names],
+               [ids[network.nodes[n][1]] for n in names])
+    instructions = [0 if d == 'L' else 1 for d in network.instructions]
+    period_jump, period_hits = [], []
+    for node in range(len(names)):
+        hits = []
+        for step, direction in enumerate(instructions, start=1):
+            node = targets[direction][node]
+            if names[node][-1] == 'Z':
+                hits.append((step, node))
+        period_jump.append(node)
+        period_hits.append(hits)
+    return CompiledNetwork(names, targets, instructions, period_jump, period_hits)
+
+
+def count_steps_compiled(compiled: CompiledNetwork, start: str, target: str) -> int:
+    node, target_node = compiled.names.index(start), compiled.names.index(target)
+    if node == target_node:
+        return 0
+    period = len(compiled.instructions)
+    for passes in range(len(compiled.names)):
+        hit = next((step for step, n in compiled.period_hits[node] if n == target_node), None)
+        if hit is not None:
+            return passes * period + hit
+        node = compiled.period_jump[node]
+    raise RuntimeError(f'{target} is never reached from {start}')
+
+
+def find_cycle_compiled(compiled: CompiledNetwork,
+                        start: int,
+                        lifting: Optional["StepLifting"] = None) -> PathCycle:
+    # a state is (instruction index, node), so any cycle spans whole passes and
+    # can be found on the nodes seen at the start of each pass
+    period = len(compiled.instructions)
+    first_seen = {}
+    boundaries = [start]
+    while boundaries[-1] not in first_seen:
+        first_seen[boundaries[-1]] = len(boundaries) - 1
+        boundaries.append(compiled.period_jump[boundaries[-1]])
+    passes_before = first_seen[boundaries[-1]]
+    length = (len(boundaries) - 1 - passes_before) * period
+
+    # the cycle may be entered in the middle of the pass preceding it
+    cycle_start = 0
+    if lifting is not None:
+        cycle_start = lifting.find_cycle_start(start, length)
+    elif passes_before > 0:
+        node = boundaries[passes_before - 1]
+        node_after_cycle = boundaries[passes_before - 1 + length // period]
+        steps = 0
+        while node != node_after_cycle:
+            direction = compiled.instructions[steps]
+            node = compiled.targets[direction][node]
+            node_after_cycle = compiled.targets[direction][node_after_cycle]
+            steps += 1
+        cycle_start = (passes_before - 1) * period + steps
+
+    hits = [0] if compiled.names[start][-1] == 'Z' else []
+    for passes, node in enumerate(boundaries[:-1]):
+        hits.extend(passes * period + step for step, _ in compiled.period_hits[node])
+    return PathCycle(cycle_start, length,
+                     [h for h in hits if h < cycle_start],
+                     [h for h in hits if cycle_start <= h < cycle_start + length])
+
+
+# state is instruction_index * nodes_count + node, jumps[k][state] is the state
+# reached after 2 ** k steps
+class StepLifting:
+    def __init__(self, compiled: CompiledNetwork, max_steps: int):
+        nodes_count, period = len(compiled.names), len(compiled.instructions)
+        targets = np.array(compiled.targets, dtype=np.int64)
+        instructions = np.array(compiled.instructions, dtype=np.int64)
+        ins_idx = np.repeat(np.arange(period), nodes_count)
+        nodes = np.tile(np.arange(nodes_count), period)
+        self.nodes_count = nodes_count
+        self.jumps = [(ins_idx + 1) % period * nodes_count + targets[instructions[ins_idx], nodes]]
+        for _ in range(1, max(1, max_steps.bit_length())):
+            self.jumps.append(self.jumps[-1][self.jumps[-1]])
+
+    def advance(self, states: np.ndarray, steps: np.ndarray) -> np.ndarray:
+        steps = np.broadcast_to(np.asarray(steps, dtype=np.int64), states.shape)
+        if np.any(steps >> len(self.jumps)):
+            raise ValueError('Steps exceed the range of the lifting tables')
+        for level, jump in enumerate(self.jumps):
+            states = np.where((steps >> level) & 1 == 1, jump[states], states)
+        return states
+
+    def find_cycle_start(self, start: int, length: int) -> int:
+        def is_in_cycle(state: int) -> bool:
+            return state == self.advance(np.array([state]), length)[0]
+        if is_in_cycle(start):
+            return 0
+        state, steps = start, 0
+        for level in reversed(range(len(self.jumps))):
+            candidate = int(self.jumps[level][state])
+            if not is_in_cycle(candidate):
+                state, steps = candidate, steps + (1 << level)
+        return steps + 1
+
+
+def nodes_after_steps(compiled: CompiledNetwork,
+                      lifting: StepLifting,
+                      starts: List[str],
+                      steps: List[int]) -> List[str]:
+    states = np.array([compiled.names.index(s) for s in starts], dtype=np.int64)
+    reached = lifting.advance(states, np.array(steps, dtype=np.int64))
+    return [compiled.names[state % lifting.nodes_count] for state in reached]
+
+
 def resolve_part1(input):
     return count_steps_to_zzz(parse_network(input))
 
 
 def resolve_part2(input):
-    return solve_with_lcm(parse_network(input))
+    return solve_with_cycles(parse_network(input))
+
+
+@register_engine('compiled', part='1')
+def resolve_part1_compiled(input):
+    return count_steps_compiled(compile_network(parse_network(input)), 'AAA', 'ZZZ')
+
+
+@register_engine('compiled', part='2')
+def resolve_part2_compiled(input):
+    compiled = compile_network(parse_network(input))
+    starting_nodes = [idx for idx, name in enumerate(compiled.names) if name[-1] == 'A']
+    return solve_cycles([find_cycle_compiled(compiled, node) for node in starting_nodes])
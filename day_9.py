@@ -1,7 +1,14 @@
-from typing import List, Iterator
+from typing import List, Iterator, Tuple
+from collections import defaultdict
 import functools
+import math
+import numpy as np
 
+from tracing import traced
+from engines import register_engine
 
+
+@traced('parse')
 def parse_values(lines: List[str]) -> List[List[int]]:
     def parse_one(line: str) -> List[int]:
         return list(map(int, line.split()))
@@ -28,6 +35,14 @@ def generate_diffs_first_numbers(values: List[int]) -> Iterator[int]:
     yield from generate_diffs_first_numbers(diff)
 
 
+def generate_diffs_edge_numbers(values: List[int]) -> Iterator[Tuple[int, int]]:
+    yield values[0], values[-1]
+    if all(v == 0 for v in values):
+        return
+    diff = generate_diff(values)
+    yield from generate_diffs_edge_numbers(diff)
+
+
 def extrapolate(values: List[int]) -> int:
     lasts = generate_diffs_last_numbers(values)
     return sum(lasts)
@@ -38,6 +53,13 @@ def extrapolate_beginnings(values: List[int]) -> int:
     return functools.reduce(lambda x, y: y - x, firsts)
 
 
+def extrapolate_both_ways(values: List[int]) -> Tuple[int, int]:
+    edges = list(generate_diffs_edge_numbers(values))
+    forward = sum(last for _, last in edges)
+    backward = functools.reduce(lambda x, y: y - x, reversed([first for first, _ in edges]))
+    return forward, backward
+
+
 def extrapolate_all(values: List[List[int]]) -> int:
     return sum(extrapolate(seq) for seq in values)
 
@@ -46,9 +68,57 @@ def extrapolate_all_beginnings(values: List[List[int]]) -> int:
     return sum(extrapolate_beginnings(seq) for seq in values)
 
 
+# extrapolating through the full difference pyramid of n values is equivalent to
+# a dot product with alternating binomial coefficients of row n
+@functools.lru_cache(maxsize=None)
+def extrapolation_coefficients(length: int) -> Tuple[List[int], List[int]]:
+    forward = [(-1) ** (length - 1 - k) * math.comb(length, k) for k in range(length)]
+    backward = [(-1) ** k * math.comb(length, k + 1) for k in range(length)]
+    return forward, backward
+
+
+def extrapolate_batch(values: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    forward = np.zeros(len(values), dtype=object)
+    backward = np.zeros(len(values), dtype=object)
+    by_length = defaultdict(list)
+    for idx, seq in enumerate(values):
+        by_length[len(seq)].append(idx)
+    for length, indices in by_length.items():
+        coeffs = np.array(extrapolation_coefficients(length), dtype=object).T
+        sequences = np.array([values[i] for i in indices], dtype=object).reshape(-1, length)
+        largest = max((abs(v) for seq in sequences for v in seq), default=0)
+        # stay with exact Python integers unless int64 cannot overflow
+        if largest * math.comb(length, length // 2) * length < 2 ** 62:
+            coeffs, sequences = coeffs.astype(np.int64), sequences.astype(np.int64)
+        extrapolated = sequences @ coeffs
+        forward[indices] = extrapolated[:, 0]
+        backward[indices] = extrapolated[:, 1]
+    return forward, backward
+
+
 def resolve_part1(input):
     return extrapolate_all(parse_values(input))
 
 
 def resolve_part2(input):
-    return extrapolate_all_beginnings(parse_values(input))
\ No newline at end of file
+    return extrapolate_all_beginnings(parse_values(input))
+
+
+@register_engine('binomial', part='1')
+def resolve_part1_binomial(input):
+    forward, _ = extrapolate_batch(parse_values(input))
+    return int(forward.sum())
+
+
+@register_engine('binomial', part='2')
+def resolve_part2_binomial(input):
+    _, backward = extrapolate_batch(parse_values(input))
+    return int(backward.sum())
+
+
+def resolve_both(input):
+    part1, part2 = 0, 0
+    for forward, backward in map(extrapolate_both_ways, parse_values(input)):
+        part1 += forward
+        part2 += backward
+    return part1, part2
\ No newline at end of file
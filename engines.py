@@ -0,0 +1,53 @@
+from typing import NamedTuple, Callable, Dict, Tuple, List, Any
+from types import ModuleType
+from collections import defaultdict
+
+
+REFERENCE_ENGINE = 'reference'
+AUTO_ENGINE = 'auto'
+
+
+class Engine(NamedTuple):
+    name: str
+    solve: Callable[[List[str]], Any]
+    min_input_size: int
+
+
+# (module name, part) -> engine name -> engine
+registered_engines: Dict[Tuple[str, str], Dict[str, Engine]] = defaultdict(dict)
+
+
+def register_engine(name: str, part: str, min_input_size: int = 0):
+    def decorator(solve: Callable[[List[str]], Any]) -> Callable[[List[str]], Any]:
+        registered_engines[(solve.__module__, part)][name] = Engine(name, solve, min_input_size)
+        return solve
+    return decorator
+
+
+def get_engines(module: ModuleType, part: str) -> Dict[str, Engine]:
+    reference = Engine(REFERENCE_ENGINE, getattr(module, f'resolve_part{part}'), 0)
+    return {REFERENCE_ENGINE: reference, **registered_engines[(module.__name__, part)]}
+
+
+def has_engine(module: ModuleType, part: str, name: str) -> bool:
+    return name == AUTO_ENGINE or name in get_engines(module, part)
+
+
+def measure_input_size(lines: List[str]) -> int:
+    return sum(len(line) for line in lines)
+
+
+def select_engine(module: ModuleType, part: str, name: str, lines: List[str]) -> Engine:
+    engines = get_engines(module, part)
+    if name == AUTO_ENGINE:
+        size = measure_input_size(lines)
+        eligible = (e for e in engines.values() if e.min_input_size <= size)
+        return max(eligible, key=lambda e: (e.min_input_size, e.name != REFERENCE_ENGINE))
+    if name not in engines:
+        raise ValueError(f'Unknown engine {name} for {module.__name__} part {part}, '
+                         f'available: {", ".join(engines.keys())}')
+    return engines[name]
+
+
+def cross_check(module: ModuleType, part: str, lines: List[str]) -> Dict[str, Any]:
+    return {name: engine.solve(lines) for name, engine in get_engines(module, part).items()}
@@ -0,0 +1,72 @@
+from typing import Iterator, Tuple, Dict, Any
+from types import ModuleType
+from contextlib import contextmanager
+import gc
+import time
+
+
+RELAXED_THRESHOLDS = (100000, 50, 100)
+
+
+class GcStats:
+    def __init__(self):
+        self.collections = 0
+        self.pause = 0.0
+        self.__started = None
+
+    def callback(self, phase: str, info: Dict[str, Any]):
+        if phase == 'start':
+            self.__started = time.perf_counter()
+        elif self.__started is not None:
+            self.collections += 1
+            self.pause += time.perf_counter() - self.__started
+            self.__started = None
+
+
+class GcSettings:
+    def __init__(self):
+        self.relaxed = False
+
+
+settings = GcSettings()
+
+
+@contextmanager
+def measure_gc() -> Iterator[GcStats]:
+    stats = GcStats()
+    gc.callbacks.append(stats.callback)
+    try:
+        yield stats
+    finally:
+        gc.callbacks.remove(stats.callback)
+
+
+# drops memoized results of the solver module and garbage left by a previous
+# run, so that runs compared against each other start from the same state
+def reset_solver_state(module: ModuleType):
+    for value in vars(module).values():
+        if hasattr(value, 'cache_clear'):
+            value.cache_clear()
+    gc.collect()
+
+
+@contextmanager
+def relaxed_collection(thresholds: Tuple[int, int, int] = RELAXED_THRESHOLDS) -> Iterator[None]:
+    previous = gc.get_threshold()
+    gc.collect()
+    gc.freeze()
+    gc.set_threshold(*thresholds)
+    settings.relaxed = True
+    try:
+        yield
+    finally:
+        settings.relaxed = False
+        gc.set_threshold(*previous)
+        gc.unfreeze()
+
+
+# solvers call this once their input is parsed, so that in relaxed mode the
+# model is moved to the permanent generation and skipped by later collections
+def freeze_parsed_model():
+    if settings.relaxed:
+        gc.freeze()
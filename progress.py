@@ -0,0 +1,91 @@
+from typing import Optional, TextIO
+import signal
+import sys
+import time
+
+
+class Cancelled(Exception):
+    pass
+
+
+class ProgressSettings:
+    def __init__(self):
+        self.report_interval: Optional[float] = None
+        self.deadline: Optional[float] = None
+        self.cancelled = False
+        self.stream: TextIO = sys.stderr
+
+
+settings = ProgressSettings()
+
+
+def configure(report_interval: Optional[float] = None,
+              time_budget: Optional[float] = None,
+              stream: TextIO = sys.stderr):
+    settings.report_interval = report_interval
+    settings.deadline = time.monotonic() + time_budget if time_budget is not None else None
+    settings.cancelled = False
+    settings.stream = stream
+
+
+def cancel(*_):
+    settings.cancelled = True
+
+
+# the first SIGTERM asks tracked loops to stop, a second one terminates the
+# process as usual in case the running solver never calls advance()
+def cancel_on_signal(signum, _):
+    cancel()
+    signal.signal(signum, signal.SIG_DFL)
+
+
+def install_termination_handler():
+    signal.signal(signal.SIGTERM, cancel_on_signal)
+
+
+# pool workers inherit the handler when forked and must stay terminable
+def restore_default_termination():
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+class Progress:
+    def __init__(self, label: str, total: Optional[int] = None):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.started = time.monotonic()
+        self.__next_report = (self.started + settings.report_interval
+                              if settings.report_interval is not None else None)
+
+    def rate(self, now: Optional[float] = None) -> float:
+        elapsed = (now if now is not None else time.monotonic()) - self.started
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def eta(self, now: Optional[float] = None) -> Optional[float]:
+        rate = self.rate(now)
+        if self.total is None or rate == 0:
+            return None
+        return (self.total - self.done) / rate
+
+    def advance(self, count: int = 1):
+        self.done += count
+        if settings.cancelled:
+            raise Cancelled(f'{self.label}: cancelled after {self.done} items')
+        if settings.deadline is None and self.__next_report is None:
+            return
+        now = time.monotonic()
+        if settings.deadline is not None and now > settings.deadline:
+            raise Cancelled(f'{self.label}: time budget exceeded after {self.done} items')
+        if self.__next_report is not None and now >= self.__next_report:
+            self.__next_report = now + settings.report_interval
+            self.report(now)
+
+    def report(self, now: Optional[float] = None):
+        done = f'{self.done}/{self.total}' if self.total is not None else str(self.done)
+        eta = self.eta(now)
+        eta_str = f', eta {eta:.1f}s' if eta is not None else ''
+        print(f'[{self.label}] {done} items, {self.rate(now):.0f}/s{eta_str}', file=settings.stream)
+
+
+def track(label: str, total: Optional[int] = None) -> Progress:
+    return Progress(label, total)
@@ -1,29 +1,123 @@
 import argparse
+from contextlib import nullcontext
 from importlib import import_module
 import sys
+import time
+
+from engines import REFERENCE_ENGINE, AUTO_ENGINE, has_engine, select_engine, cross_check
+import progress
+import gc_stats
+import tracing
+from tracing import span
 
 parser = argparse.ArgumentParser(description='Advent of code 2023')
 parser.add_argument('--day', '-d', help='day in advent', type=int, required=True)
 parser.add_argument('--part', '-p', help='part of puzzle to solve', choices=['1', '2', 'both'], default='both')
 parser.add_argument('--input', '-i', help='input file')
+parser.add_argument('--engine', '-e', help=f'solver engine name or "{AUTO_ENGINE}" to pick one by input size',
+                    default=REFERENCE_ENGINE)
+parser.add_argument('--cross-check', help='run every registered engine and compare results',
+                    action='store_true')
+parser.add_argument('--progress', help='report progress of long-running loops every N seconds',
+                    type=float, metavar='SECONDS')
+parser.add_argument('--gc-report', help='solve each part with default and relaxed GC and report pauses',
+                    action='store_true')
+parser.add_argument('--trace', help='write a Chrome trace-event timeline to the given file', metavar='PATH')
+parser.add_argument('--time-budget', help='cancel solving after N seconds', type=float, metavar='SECONDS')
+
+
+def run_cross_check(daily_module, parts, lines) -> bool:
+    consistent = True
+    for part in parts:
+        results = cross_check(daily_module, part, lines)
+        for name, result in results.items():
+            print(f'Part {part} [{name}]:', result)
+        if len(set(map(str, results.values()))) > 1:
+            print(f'Part {part}: engines disagree')
+            consistent = False
+    return consistent
+
+
+def run_gc_report(daily_module, solver, part, lines):
+    for mode in ('default', 'relaxed'):
+        gc_stats.reset_solver_state(daily_module)
+        gc_mode = gc_stats.relaxed_collection() if mode == 'relaxed' else nullcontext()
+        with gc_mode, gc_stats.measure_gc() as stats, span(f'solve part {part}', 'runner', gc=mode):
+            started = time.perf_counter()
+            result = solver.solve(lines)
+            elapsed = time.perf_counter() - started
+        print(f'Part {part} solution [{mode} gc]:', result,
+              f'({elapsed:.3f}s, {stats.collections} collections, {stats.pause * 1000:.1f}ms paused)')
+
+
+def solve(args, daily_module, lines):
+    part_to_solve = args['part']
+    parts = ['1', '2'] if part_to_solve == 'both' else [part_to_solve]
+    if args['cross_check']:
+        sys.exit(0 if run_cross_check(daily_module, parts, lines) else 1)
+
+    engine = args['engine']
+    if (part_to_solve == 'both' and engine == REFERENCE_ENGINE and not args['gc_report']
+            and hasattr(daily_module, 'resolve_both')):
+        with span('solve both parts', 'runner'):
+            part1, part2 = getattr(daily_module, 'resolve_both')(lines)
+        print('Part 1 solution:', part1)
+        print('Part 2 solution:', part2)
+        return
+
+    # engines are mostly registered for a single part, the other part falls
+    # back to the reference one unless no part has the requested engine
+    engine_parts = [part for part in parts if has_engine(daily_module, part, engine)]
+    for part in parts:
+        part_engine = engine
+        if engine_parts and part not in engine_parts:
+            part_engine = REFERENCE_ENGINE
+            print(f'Part {part}: no {engine} engine, using {REFERENCE_ENGINE}')
+        try:
+            solver = select_engine(daily_module, part, part_engine, lines)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        if args['gc_report']:
+            run_gc_report(daily_module, solver, part, lines)
+        else:
+            with span(f'solve part {part}', 'runner', engine=solver.name):
+                result = solver.solve(lines)
+            print(f'Part {part} solution:', result)
+
+
+def main():
+    args = vars(parser.parse_args())
 
+    day = args['day']
+    input_file = args['input'] if args['input'] is not None else f'day_{day}.in'
 
-args = vars(parser.parse_args())
+    if args['trace'] is not None:
+        tracing.enable(args['trace'])
+    try:
+        with span('read input', 'runner'):
+            with open(input_file) as file:
+                lines = [line.rstrip() for line in file]
 
-day = args['day']
-input_file = args['input'] if args['input'] is not None else f'day_{day}.in'
+        try:
+            with span('import module', 'runner'):
+                daily_module = import_module(f'day_{day}')
+        except ImportError:
+            print('Specified day is invalid')
+            sys.exit(1)
 
-with open(input_file) as file:
-    lines = [line.rstrip() for line in file]
+        progress.configure(report_interval=args['progress'], time_budget=args['time_budget'])
+        if args['progress'] is not None or args['time_budget'] is not None:
+            progress.install_termination_handler()
+        try:
+            solve(args, daily_module, lines)
+        except progress.Cancelled as e:
+            print('Solving cancelled:', e)
+            sys.exit(2)
+    finally:
+        if tracing.recorder.enabled:
+            tracing.write()
 
-try:
-    daily_module = import_module(f'day_{day}')
-except ImportError:
-    print('Specified day is invalid')
-    sys.exit(1)
 
-part_to_solve = args['part']
-if part_to_solve in ('1', 'both'):
-    print('Part 1 solution:', getattr(daily_module, 'resolve_part1')(lines))
-if part_to_solve in ('2', 'both'):
-    print('Part 2 solution:', getattr(daily_module, 'resolve_part2')(lines))
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+from typing import NamedTuple, List, Iterator, Sequence
+from multiprocessing import shared_memory, util
+from contextlib import contextmanager
+
+
+class SharedGrid(NamedTuple):
+    name: str
+    width: int
+    height: int
+
+
+def release_attachment(block: shared_memory.SharedMemory, rows: List[memoryview]):
+    for row in rows:
+        row.release()
+    block.close()
+
+
+class AttachedGrid:
+    def __init__(self, grid: SharedGrid):
+        block = shared_memory.SharedMemory(name=grid.name)
+        self.width = grid.width
+        self.height = grid.height
+        # rows are views into the shared block, indexing them yields byte values;
+        # they stay valid until the attachment is closed or garbage collected
+        self.rows = [block.buf[y * grid.width:(y + 1) * grid.width]
+                     for y in range(grid.height)]
+        # the finalizer must not reference self, otherwise it would keep the
+        # attachment alive until the process exits
+        self.__finalizer = util.Finalize(self, release_attachment, args=(block, self.rows),
+                                         exitpriority=10)
+
+    def close(self):
+        self.__finalizer()
+
+
+@contextmanager
+def share_grid(rows: Sequence[bytes]) -> Iterator[SharedGrid]:
+    width, height = len(rows[0]), len(rows)
+    block = shared_memory.SharedMemory(create=True, size=max(1, width * height))
+    try:
+        block.buf[:width * height] = b''.join(rows)
+        yield SharedGrid(block.name, width, height)
+    finally:
+        block.close()
+        block.unlink()
+
+
+def attach_grid(grid: SharedGrid) -> AttachedGrid:
+    return AttachedGrid(grid)
@@ -0,0 +1,119 @@
+from typing import List, Dict, Any, Optional, Iterator, Callable, NamedTuple
+from contextlib import contextmanager
+from multiprocessing import util
+import functools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+
+class TraceConfig(NamedTuple):
+    path: str
+    # side files of this run's workers, removed once merged
+    parts_dir: str
+    owner_pid: int
+
+
+class TraceRecorder:
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.parts_dir: Optional[str] = None
+        self.owner_pid: Optional[int] = None
+        self.events: List[Dict[str, Any]] = []
+        self.worker_flush_registered = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+
+recorder = TraceRecorder()
+
+
+def enable(path: str):
+    parts_dir = tempfile.mkdtemp(prefix=f'{os.path.basename(path)}.',
+                                 dir=os.path.dirname(os.path.abspath(path)))
+    configure(TraceConfig(path, parts_dir, os.getpid()))
+
+
+def configure(config: TraceConfig):
+    recorder.path = config.path
+    recorder.parts_dir = config.parts_dir
+    recorder.owner_pid = config.owner_pid
+    recorder.events = []
+
+
+def worker_config() -> Optional[TraceConfig]:
+    if not recorder.enabled:
+        return None
+    return TraceConfig(recorder.path, recorder.parts_dir, recorder.owner_pid)
+
+
+# pool initializers call this with worker_config() of the owning process, as
+# workers started with spawn or forkserver do not inherit the recorder
+def init_worker(config: Optional[TraceConfig]):
+    if config is not None:
+        configure(config)
+
+
+def worker_events_path(pid: int) -> str:
+    return os.path.join(recorder.parts_dir, f'{pid}.part')
+
+
+def flush_worker_events():
+    with open(worker_events_path(os.getpid()), 'w') as file:
+        json.dump(recorder.events, file)
+
+
+def record(event: Dict[str, Any]):
+    recorder.events.append(event)
+    # events of pool workers are dumped to side files when the worker exits
+    # and merged by the owning process in write()
+    if os.getpid() != recorder.owner_pid and not recorder.worker_flush_registered:
+        recorder.events = [event]
+        recorder.worker_flush_registered = True
+        util.Finalize(None, flush_worker_events, exitpriority=10)
+
+
+@contextmanager
+def span(name: str, category: str = 'solver', **args) -> Iterator[None]:
+    if not recorder.enabled:
+        yield
+        return
+    started = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record({
+            'name': name, 'cat': category, 'ph': 'X',
+            'ts': started / 1000, 'dur': (time.perf_counter_ns() - started) / 1000,
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': args
+        })
+
+
+def traced(name: str, category: str = 'solver'):
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def write():
+    events = list(recorder.events)
+    for part_name in sorted(os.listdir(recorder.parts_dir)):
+        with open(os.path.join(recorder.parts_dir, part_name)) as file:
+            events.extend(json.load(file))
+    shutil.rmtree(recorder.parts_dir, ignore_errors=True)
+
+    for pid in sorted({e['pid'] for e in events}):
+        process_name = 'runner' if pid == recorder.owner_pid else f'worker {pid}'
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                       'args': {'name': process_name}})
+    with open(recorder.path, 'w') as file:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file)